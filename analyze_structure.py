@@ -57,8 +57,7 @@ def analyze_conversations_content(data):
         max_ts = max(timestamps)
         print(f"Date Range: {datetime.fromtimestamp(min_ts)} to {datetime.fromtimestamp(max_ts)}")
 
-def main():
-    file_path = 'conversations.json'
+def main(file_path='conversations.json'):
     try:
         print(f"Loading {file_path}...")
         with open(file_path, 'r', encoding='utf-8') as f:
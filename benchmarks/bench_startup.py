@@ -0,0 +1,68 @@
+"""
+Startup-time benchmark for the migration CLI.
+
+Measures how long a fresh interpreter takes to get through argument parsing
+for each subcommand, and which modules get imported on the way. Run with:
+
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / 'migrate_to_gemini.py'
+
+COMMANDS = [
+    ('python -c pass', ['-c', 'pass']),
+    ('--help', [str(SCRIPT), '--help']),
+    ('migrate --help', [str(SCRIPT), 'migrate', '--help']),
+    ('export --help', [str(SCRIPT), 'export', '--help']),
+    ('analyze --help', [str(SCRIPT), 'analyze', '--help']),
+    ('serve --help', [str(SCRIPT), 'serve', '--help']),
+]
+
+# Modules that should only be loaded by the subcommands that use them
+HEAVY_MODULES = ['http.server', 'socketserver', 'webbrowser', 'csv', 'analyze_structure']
+
+
+def time_command(args, runs):
+    """Return wall-clock times in milliseconds for running the command."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def loaded_heavy_modules():
+    """Return the heavy modules imported when the CLI is loaded."""
+    code = (
+        'import sys; sys.argv = ["x"]; '
+        'import migrate_to_gemini; '
+        f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                            capture_output=True, text=True)
+    return [m for m in result.stdout.strip().split(',') if m]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"Startup benchmark ({runs} runs each)\n")
+    print(f"{'command':<20} {'median ms':>10} {'min ms':>10} {'max ms':>10}")
+    for label, args in COMMANDS:
+        times = time_command(args, runs)
+        print(f"{label:<20} {statistics.median(times):>10.1f} {min(times):>10.1f} {max(times):>10.1f}")
+
+    heavy = loaded_heavy_modules()
+    print(f"\nHeavy modules imported at startup: {', '.join(heavy) if heavy else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark of TimestampFormatter against formatting each timestamp directly.
+
+Timestamps are generated the way they appear in an export: conversations of
+a few dozen messages, each a few seconds to minutes apart. Run with:
+
+    python benchmarks/bench_timestamps.py [count]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from timestamp_formatter import DEFAULT_FORMAT, TimestampFormatter
+
+
+def make_conversations(count, seed=0):
+    """Return lists of message timestamps totalling ``count`` timestamps."""
+    rng = random.Random(seed)
+    conversations = []
+    remaining = count
+    start = 1_650_000_000.0
+    while remaining > 0:
+        size = min(remaining, rng.randint(2, 60))
+        ts = start + rng.uniform(0, 3600)
+        messages = []
+        for _ in range(size):
+            messages.append(ts)
+            ts += rng.uniform(0.5, 120)
+        conversations.append(messages)
+        remaining -= size
+        start += rng.uniform(3600, 86400)
+    return conversations
+
+
+def bench(label, func, conversations):
+    start = time.perf_counter()
+    result = func(conversations)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:>8.3f} s")
+    return result
+
+
+def naive(conversations):
+    return [[datetime.fromtimestamp(ts).strftime(DEFAULT_FORMAT) for ts in conv]
+            for conv in conversations]
+
+
+def per_item(conversations):
+    formatter = TimestampFormatter()
+    return [[formatter.format(ts) for ts in conv] for conv in conversations]
+
+
+def batched(conversations):
+    formatter = TimestampFormatter()
+    return [formatter.format_many(conv) for conv in conversations]
+
+
+def batched_iso_utc(conversations):
+    formatter = TimestampFormatter('UTC', iso=True)
+    return [formatter.format_many(conv) for conv in conversations]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    conversations = make_conversations(count)
+    print(f"Formatting {count:,} timestamps in {len(conversations):,} conversations\n")
+
+    expected = bench('datetime.fromtimestamp/strftime', naive, conversations)
+    assert bench('TimestampFormatter.format', per_item, conversations) == expected
+    assert bench('TimestampFormatter.format_many', batched, conversations) == expected
+    bench('format_many (UTC, ISO-8601)', batched_iso_utc, conversations)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,149 @@
+import io
 import json
 import os
 import sys
-from datetime import datetime
+from contextlib import contextmanager
 from pathlib import Path
-import html
 import re
 
+from timestamp_formatter import TimestampFormatter
+
 # Fix Windows console encoding
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
+# Viewer templates live next to this script and are only read when needed
+TEMPLATES_DIR = Path(__file__).parent / 'templates'
+TEMPLATE_DATA_PLACEHOLDER = '__CONVERSATIONS_JSON__'
+
+EXPORT_FORMATS = ('markdown', 'json', 'csv', 'html')
+
+# Progress of an interrupted migration is kept in the output directory
+CHECKPOINT_FILE = '.migration_checkpoint.json'
+CHECKPOINT_SPOOL_FILE = '.migration_checkpoint.jsonl'
+CHECKPOINT_INTERVAL = 100
+
+# Optional precompressed copies of the viewer and JSON export
+COMPRESSED_SUFFIXES = {'gzip': '.gz', 'brotli': '.br'}
+GZIP_DEFAULT_LEVEL = 9
+BROTLI_DEFAULT_LEVEL = 11
+
+_template_cache = {}
+
+
+def _load_template(name):
+    """Read a template from the templates folder, caching it after first use."""
+    if name not in _template_cache:
+        _template_cache[name] = (TEMPLATES_DIR / name).read_text(encoding='utf-8')
+    return _template_cache[name]
+
+
+class _CompressedSiblingWriter(io.RawIOBase):
+    """Binary stream that writes to a file and its compressed siblings at once."""
+    
+    def __init__(self, path, encodings, level):
+        super().__init__()
+        self.files = []
+        self.gzip_files = []
+        self.brotli_compressors = []
+        
+        try:
+            self.plain = self._open(path)
+            for encoding in encodings:
+                sibling = self._open(path + COMPRESSED_SUFFIXES[encoding])
+                if encoding == 'gzip':
+                    import gzip
+                    gzip_level = GZIP_DEFAULT_LEVEL if level is None else min(level, 9)
+                    # mtime=0 keeps the output identical between runs
+                    self.gzip_files.append(gzip.GzipFile(filename='', fileobj=sibling, mode='wb',
+                                                         compresslevel=gzip_level, mtime=0))
+                else:
+                    import brotli
+                    brotli_level = BROTLI_DEFAULT_LEVEL if level is None else level
+                    self.brotli_compressors.append((brotli.Compressor(quality=brotli_level), sibling))
+        except BaseException:
+            self.close()
+            raise
+    
+    def _open(self, path):
+        f = open(path, 'wb')
+        self.files.append(f)
+        return f
+    
+    def writable(self):
+        return True
+    
+    def write(self, b):
+        self.plain.write(b)
+        for gz in self.gzip_files:
+            gz.write(b)
+        for compressor, sibling in self.brotli_compressors:
+            sibling.write(compressor.process(bytes(b)))
+        return len(b)
+    
+    def finish(self):
+        """Flush the compressors and sync every file to disk."""
+        for gz in self.gzip_files:
+            gz.close()
+        for compressor, sibling in self.brotli_compressors:
+            sibling.write(compressor.finish())
+        for f in self.files:
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def close(self):
+        for f in self.files:
+            f.close()
+        super().close()
+
+
+def _check_compression_support(encodings):
+    """Raise ImportError if an optional compressor is not installed."""
+    if 'brotli' in encodings:
+        try:
+            import brotli  # noqa: F401
+        except ImportError:
+            raise ImportError("brotli output needs the 'brotli' package (pip install brotli)")
+
+
+@contextmanager
+def _atomic_open(path, newline=None, compress=(), level=None):
+    """Open a temporary file for writing that replaces ``path`` only on success.
+    
+    For each encoding in ``compress`` a compressed sibling (``path.gz``,
+    ``path.br``) is streamed alongside the plain file and replaced with it.
+    Siblings for encodings that were not requested are removed so they
+    never go stale.
+    """
+    path = str(path)
+    tmp_path = path + '.tmp'
+    raw = None
+    try:
+        raw = _CompressedSiblingWriter(tmp_path, compress, level)
+        with io.TextIOWrapper(io.BufferedWriter(raw), encoding='utf-8', newline=newline) as f:
+            yield f
+            f.flush()
+            raw.finish()
+        os.replace(tmp_path, path)
+        for encoding, suffix in COMPRESSED_SUFFIXES.items():
+            if encoding in compress:
+                os.replace(tmp_path + suffix, path + suffix)
+            elif os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    except BaseException:
+        if raw is not None:
+            raw.close()
+        for suffix in ('',) + tuple(COMPRESSED_SUFFIXES.values()):
+            if os.path.exists(tmp_path + suffix):
+                os.remove(tmp_path + suffix)
+        raise
+
+
 class ChatGPTMigrator:
     """Migrates ChatGPT conversations to various formats for Gemini compatibility."""
     
-    def __init__(self, conversations_file=None):
+    def __init__(self, conversations_file=None, compress=(), compression_level=None,
+                 timestamp_formatter=None):
         # Check for file in input folder first, then root
         if conversations_file is None:
             if Path('input/conversations.json').exists():
@@ -26,6 +156,9 @@ class ChatGPTMigrator:
         self.conversations_file = conversations_file
         self.conversations = []
         self.output_dir = Path('migrated_conversations')
+        self.compress = tuple(compress)
+        self.compression_level = compression_level
+        self.timestamps = timestamp_formatter or TimestampFormatter()
         
     def load_conversations(self):
         """Load conversations from ChatGPT export."""
@@ -84,11 +217,51 @@ class ChatGPTMigrator:
             'title': title,
             'create_time': create_time,
             'update_time': update_time,
-            'create_date': datetime.fromtimestamp(create_time).strftime('%Y-%m-%d %H:%M:%S') if create_time else 'Unknown',
+            'create_date': self.timestamps.format(create_time, default='Unknown'),
             'messages': messages,
             'message_count': len(messages)
         }
     
+    def _extract_all(self):
+        """Extract data for every loaded conversation."""
+        return [self.extract_conversation_data(conv) for conv in self.conversations]
+    
+    def _write_markdown_file(self, md_dir, idx, data):
+        """Write a single conversation as a markdown file."""
+        # Create safe filename
+        safe_title = re.sub(r'[<>:"/\\|?*]', '_', data['title'])[:100]
+        filename = f"{idx:04d}_{safe_title}.md"
+        
+        # Generate markdown content
+        md_content = f"# {data['title']}\n\n"
+        md_content += f"**Created:** {data['create_date']}  \n"
+        md_content += f"**Messages:** {data['message_count']}\n\n"
+        md_content += "---\n\n"
+        
+        # Format all message times of the conversation in one batch
+        timestamps = self.timestamps.format_many(msg.get('create_time') for msg in data['messages'])
+        
+        for msg, timestamp in zip(data['messages'], timestamps):
+            role = msg['role'].upper()
+            content = msg['content']
+            
+            if role == 'USER':
+                md_content += f"## 👤 User\n"
+            elif role == 'ASSISTANT':
+                md_content += f"## 🤖 Assistant\n"
+            else:
+                md_content += f"## {role}\n"
+            
+            if timestamp:
+                md_content += f"*{timestamp}*\n\n"
+            
+            md_content += f"{content}\n\n"
+            md_content += "---\n\n"
+        
+        # Write file
+        with open(md_dir / filename, 'w', encoding='utf-8') as f:
+            f.write(md_content)
+    
     def export_to_markdown(self):
         """Export each conversation as a markdown file."""
         md_dir = self.output_dir / 'markdown'
@@ -98,64 +271,31 @@ class ChatGPTMigrator:
         
         for idx, conv in enumerate(self.conversations, 1):
             data = self.extract_conversation_data(conv)
-            
-            # Create safe filename
-            safe_title = re.sub(r'[<>:"/\\|?*]', '_', data['title'])[:100]
-            filename = f"{idx:04d}_{safe_title}.md"
-            
-            # Generate markdown content
-            md_content = f"# {data['title']}\n\n"
-            md_content += f"**Created:** {data['create_date']}  \n"
-            md_content += f"**Messages:** {data['message_count']}\n\n"
-            md_content += "---\n\n"
-            
-            for msg in data['messages']:
-                role = msg['role'].upper()
-                content = msg['content']
-                timestamp = datetime.fromtimestamp(msg['create_time']).strftime('%Y-%m-%d %H:%M:%S') if msg.get('create_time') else ''
-                
-                if role == 'USER':
-                    md_content += f"## 👤 User\n"
-                elif role == 'ASSISTANT':
-                    md_content += f"## 🤖 Assistant\n"
-                else:
-                    md_content += f"## {role}\n"
-                
-                if timestamp:
-                    md_content += f"*{timestamp}*\n\n"
-                
-                md_content += f"{content}\n\n"
-                md_content += "---\n\n"
-            
-            # Write file
-            with open(md_dir / filename, 'w', encoding='utf-8') as f:
-                f.write(md_content)
+            self._write_markdown_file(md_dir, idx, data)
             
             if idx % 50 == 0:
                 print(f"  Processed {idx}/{len(self.conversations)} conversations...")
         
         print(f"✅ Exported {len(self.conversations)} markdown files to {md_dir}")
     
-    def export_to_json(self):
+    def export_to_json(self, all_data=None):
         """Export conversations to a clean JSON format."""
         json_dir = self.output_dir / 'json'
         json_dir.mkdir(parents=True, exist_ok=True)
         
         print(f"\n📦 Exporting to JSON...")
         
-        all_conversations = []
-        for conv in self.conversations:
-            data = self.extract_conversation_data(conv)
-            all_conversations.append(data)
+        if all_data is None:
+            all_data = self._extract_all()
         
         # Single file with all conversations
         output_file = json_dir / 'all_conversations.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_conversations, f, indent=2, ensure_ascii=False)
+        with _atomic_open(output_file, compress=self.compress, level=self.compression_level) as f:
+            json.dump(all_data, f, indent=2, ensure_ascii=False)
         
         print(f"✅ Exported to {output_file}")
     
-    def export_to_csv(self):
+    def export_to_csv(self, all_data=None):
         """Export conversation metadata to CSV for analysis."""
         import csv
         
@@ -164,13 +304,15 @@ class ChatGPTMigrator:
         
         print(f"\n📊 Exporting to CSV...")
         
+        if all_data is None:
+            all_data = self._extract_all()
+        
         # Conversation summary CSV
-        with open(csv_dir / 'conversation_summary.csv', 'w', newline='', encoding='utf-8') as f:
+        with _atomic_open(csv_dir / 'conversation_summary.csv', newline='') as f:
             writer = csv.writer(f)
             writer.writerow(['ID', 'Title', 'Created', 'Updated', 'Message Count', 'User Messages', 'Assistant Messages'])
             
-            for idx, conv in enumerate(self.conversations, 1):
-                data = self.extract_conversation_data(conv)
+            for idx, data in enumerate(all_data, 1):
                 user_count = sum(1 for m in data['messages'] if m['role'] == 'user')
                 assistant_count = sum(1 for m in data['messages'] if m['role'] == 'assistant')
                 
@@ -178,7 +320,7 @@ class ChatGPTMigrator:
                     idx,
                     data['title'],
                     data['create_date'],
-                    datetime.fromtimestamp(data['update_time']).strftime('%Y-%m-%d %H:%M:%S') if data['update_time'] else '',
+                    self.timestamps.format(data['update_time']),
                     data['message_count'],
                     user_count,
                     assistant_count
@@ -186,25 +328,24 @@ class ChatGPTMigrator:
         
         print(f"✅ Exported to {csv_dir / 'conversation_summary.csv'}")
     
-    def generate_html_viewer(self):
+    def generate_html_viewer(self, all_data=None):
         """Generate an interactive HTML viewer for all conversations."""
         html_dir = self.output_dir / 'html'
         html_dir.mkdir(parents=True, exist_ok=True)
         
         print(f"\n🌐 Generating HTML viewer...")
         
-        # Extract all conversation data
-        all_data = []
-        for idx, conv in enumerate(self.conversations, 1):
-            data = self.extract_conversation_data(conv)
-            data['id'] = idx
-            all_data.append(data)
+        if all_data is None:
+            all_data = self._extract_all()
+        
+        # Number conversations for the viewer without touching the shared data
+        viewer_data = [dict(data, id=idx) for idx, data in enumerate(all_data, 1)]
         
         # Generate HTML
-        html_content = self._generate_html_template(all_data)
+        html_content = self._generate_html_template(viewer_data)
         
         output_file = html_dir / 'conversation_viewer.html'
-        with open(output_file, 'w', encoding='utf-8') as f:
+        with _atomic_open(output_file, compress=self.compress, level=self.compression_level) as f:
             f.write(html_content)
         
         print(f"✅ Generated HTML viewer at {output_file}")
@@ -214,374 +355,92 @@ class ChatGPTMigrator:
         """Generate the HTML template with embedded data."""
         conversations_json = json.dumps(conversations_data, ensure_ascii=False)
         
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>ChatGPT Conversations Viewer</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 20px;
-        }}
-        
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 20px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            overflow: hidden;
-            display: grid;
-            grid-template-columns: 350px 1fr;
-            height: calc(100vh - 40px);
-        }}
-        
-        .sidebar {{
-            background: #f8f9fa;
-            border-right: 1px solid #e0e0e0;
-            display: flex;
-            flex-direction: column;
-        }}
-        
-        .header {{
-            padding: 30px 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-        }}
-        
-        .header h1 {{
-            font-size: 24px;
-            margin-bottom: 10px;
-        }}
-        
-        .stats {{
-            font-size: 14px;
-            opacity: 0.9;
-        }}
-        
-        .search-box {{
-            padding: 15px;
-            border-bottom: 1px solid #e0e0e0;
-        }}
-        
-        .search-box input {{
-            width: 100%;
-            padding: 12px 15px;
-            border: 2px solid #e0e0e0;
-            border-radius: 10px;
-            font-size: 14px;
-            transition: all 0.3s;
-        }}
-        
-        .search-box input:focus {{
-            outline: none;
-            border-color: #667eea;
-            box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
-        }}
-        
-        .conversation-list {{
-            flex: 1;
-            overflow-y: auto;
-            padding: 10px;
-        }}
-        
-        .conversation-item {{
-            padding: 15px;
-            margin-bottom: 8px;
-            background: white;
-            border-radius: 10px;
-            cursor: pointer;
-            transition: all 0.2s;
-            border: 2px solid transparent;
-        }}
-        
-        .conversation-item:hover {{
-            background: #f0f0f0;
-            transform: translateX(5px);
-        }}
-        
-        .conversation-item.active {{
-            background: #667eea;
-            color: white;
-            border-color: #667eea;
-        }}
-        
-        .conversation-item .title {{
-            font-weight: 600;
-            margin-bottom: 5px;
-            font-size: 14px;
-        }}
-        
-        .conversation-item .meta {{
-            font-size: 12px;
-            opacity: 0.7;
-        }}
-        
-        .main-content {{
-            display: flex;
-            flex-direction: column;
-            background: white;
-        }}
-        
-        .content-header {{
-            padding: 30px;
-            border-bottom: 1px solid #e0e0e0;
-            background: #fafafa;
-        }}
-        
-        .content-header h2 {{
-            font-size: 28px;
-            margin-bottom: 10px;
-            color: #333;
-        }}
-        
-        .content-header .info {{
-            color: #666;
-            font-size: 14px;
-        }}
-        
-        .messages {{
-            flex: 1;
-            overflow-y: auto;
-            padding: 30px;
-        }}
-        
-        .message {{
-            margin-bottom: 30px;
-            animation: fadeIn 0.3s;
-        }}
-        
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(10px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-        
-        .message-header {{
-            display: flex;
-            align-items: center;
-            margin-bottom: 10px;
-            gap: 10px;
-        }}
-        
-        .message-role {{
-            font-weight: 700;
-            font-size: 14px;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }}
-        
-        .message.user .message-role {{
-            color: #667eea;
-        }}
-        
-        .message.assistant .message-role {{
-            color: #764ba2;
-        }}
-        
-        .message-time {{
-            font-size: 12px;
-            color: #999;
-        }}
-        
-        .message-content {{
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 12px;
-            line-height: 1.6;
-            white-space: pre-wrap;
-            word-wrap: break-word;
-        }}
-        
-        .message.user .message-content {{
-            background: #e7f3ff;
-            border-left: 4px solid #667eea;
-        }}
-        
-        .message.assistant .message-content {{
-            background: #f3e7ff;
-            border-left: 4px solid #764ba2;
-        }}
-        
-        .empty-state {{
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            height: 100%;
-            color: #999;
-            font-size: 18px;
-        }}
-        
-        .no-results {{
-            text-align: center;
-            padding: 40px;
-            color: #999;
-        }}
-        
-        ::-webkit-scrollbar {{
-            width: 8px;
-        }}
-        
-        ::-webkit-scrollbar-track {{
-            background: #f1f1f1;
-        }}
-        
-        ::-webkit-scrollbar-thumb {{
-            background: #888;
-            border-radius: 4px;
-        }}
-        
-        ::-webkit-scrollbar-thumb:hover {{
-            background: #555;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="sidebar">
-            <div class="header">
-                <h1>💬 ChatGPT Archive</h1>
-                <div class="stats">
-                    <div id="totalConversations"></div>
-                    <div id="totalMessages"></div>
-                </div>
-            </div>
-            <div class="search-box">
-                <input type="text" id="searchInput" placeholder="🔍 Search conversations...">
-            </div>
-            <div class="conversation-list" id="conversationList"></div>
-        </div>
-        
-        <div class="main-content">
-            <div class="content-header" id="contentHeader" style="display: none;">
-                <h2 id="conversationTitle"></h2>
-                <div class="info" id="conversationInfo"></div>
-            </div>
-            <div class="messages" id="messagesContainer">
-                <div class="empty-state">
-                    👈 Select a conversation to view
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        const conversations = {conversations_json};
-        let filteredConversations = conversations;
-        let currentConversation = null;
-        
-        function init() {{
-            updateStats();
-            renderConversationList();
-            setupSearch();
-        }}
-        
-        function updateStats() {{
-            const totalMessages = conversations.reduce((sum, conv) => sum + conv.message_count, 0);
-            document.getElementById('totalConversations').textContent = `${{conversations.length}} conversations`;
-            document.getElementById('totalMessages').textContent = `${{totalMessages}} messages`;
-        }}
-        
-        function renderConversationList() {{
-            const listEl = document.getElementById('conversationList');
-            
-            if (filteredConversations.length === 0) {{
-                listEl.innerHTML = '<div class="no-results">No conversations found</div>';
-                return;
-            }}
-            
-            listEl.innerHTML = filteredConversations.map(conv => `
-                <div class="conversation-item" onclick="selectConversation(${{conv.id}})" id="conv-${{conv.id}}">
-                    <div class="title">${{escapeHtml(conv.title)}}</div>
-                    <div class="meta">${{conv.create_date}} • ${{conv.message_count}} messages</div>
-                </div>
-            `).join('');
-        }}
-        
-        function selectConversation(id) {{
-            currentConversation = conversations.find(c => c.id === id);
-            
-            // Update active state
-            document.querySelectorAll('.conversation-item').forEach(el => el.classList.remove('active'));
-            document.getElementById(`conv-${{id}}`).classList.add('active');
-            
-            // Render conversation
-            renderConversation();
-        }}
-        
-        function renderConversation() {{
-            if (!currentConversation) return;
-            
-            // Update header
-            document.getElementById('contentHeader').style.display = 'block';
-            document.getElementById('conversationTitle').textContent = currentConversation.title;
-            document.getElementById('conversationInfo').textContent = 
-                `Created: ${{currentConversation.create_date}} • ${{currentConversation.message_count}} messages`;
-            
-            // Render messages
-            const messagesEl = document.getElementById('messagesContainer');
-            
-            // Filter out empty messages
-            const validMessages = currentConversation.messages.filter(msg => {{
-                return msg.content && msg.content.trim().length > 0;
-            }});
-            
-            messagesEl.innerHTML = validMessages.map(msg => {{
-                const time = msg.create_time ? new Date(msg.create_time * 1000).toLocaleString() : '';
-                return `
-                    <div class="message ${{msg.role}}">
-                        <div class="message-header">
-                            <span class="message-role">${{msg.role === 'user' ? '👤 User' : '🤖 Assistant'}}</span>
-                            <span class="message-time">${{time}}</span>
-                        </div>
-                        <div class="message-content">${{escapeHtml(msg.content)}}</div>
-                    </div>
-                `;
-            }}).join('');
-            
-            messagesEl.scrollTop = 0;
-        }}
+        return _load_template('conversation_viewer.html').replace(TEMPLATE_DATA_PLACEHOLDER, conversations_json, 1)
+    
+    def _input_fingerprint(self):
+        """Identify the input file so a checkpoint is not applied to a replaced export."""
+        source = Path(self.conversations_file).resolve()
+        stat = source.stat()
+        return {'path': str(source), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    
+    def _load_checkpoint(self):
+        """Return the saved checkpoint if it matches the current input, else None."""
+        checkpoint_file = self.output_dir / CHECKPOINT_FILE
+        if not checkpoint_file.exists():
+            return None
+        
+        try:
+            with open(checkpoint_file, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            print(f"⚠️  Checkpoint {checkpoint_file} is unreadable, starting from scratch")
+            return None
+        
+        if (checkpoint.get('source') != self._input_fingerprint()
+                or checkpoint.get('total') != len(self.conversations)
+                or checkpoint.get('dates') != self.timestamps.settings()):
+            print(f"⚠️  Checkpoint was written for a different input or date settings, starting from scratch")
+            return None
+        
+        spool_file = self.output_dir / CHECKPOINT_SPOOL_FILE
+        if not spool_file.exists() or spool_file.stat().st_size < checkpoint.get('spool_offset', 0):
+            print(f"⚠️  Checkpoint data in {spool_file} is missing, starting from scratch")
+            return None
+        
+        return checkpoint
+    
+    def _restore_compression(self, checkpoint):
+        """Use the interrupted run's compression settings so its siblings are kept."""
+        compress = tuple(checkpoint.get('compress', ()))
+        level = checkpoint.get('compression_level')
+        if (compress, level) == (self.compress, self.compression_level):
+            return
+        
+        _check_compression_support(compress)
+        print(f"💡 Using the interrupted run's compression settings: "
+              f"{', '.join(compress) or 'none'}"
+              f"{f' (level {level})' if compress and level is not None else ''}")
+        self.compress = compress
+        self.compression_level = level
+    
+    def _save_checkpoint(self, completed, spool):
+        """Flush the spooled data and record how far the run has got."""
+        spool.flush()
+        os.fsync(spool.fileno())
+        
+        checkpoint = {
+            'source': self._input_fingerprint(),
+            'total': len(self.conversations),
+            'dates': self.timestamps.settings(),
+            'compress': list(self.compress),
+            'compression_level': self.compression_level,
+            'completed': completed,
+            'spool_offset': spool.tell(),
+        }
+        with _atomic_open(self.output_dir / CHECKPOINT_FILE) as f:
+            json.dump(checkpoint, f)
+    
+    def _clear_checkpoint(self):
+        """Remove the checkpoint and spool once a run has finished."""
+        for name in (CHECKPOINT_FILE, CHECKPOINT_SPOOL_FILE):
+            path = self.output_dir / name
+            if path.exists():
+                path.unlink()
+    
+    def run_migration(self, resume=False, checkpoint_every=CHECKPOINT_INTERVAL):
+        """Run the complete migration process.
+        
+        Conversations are processed in a single pass. Each one is written to
+        markdown and its extracted data is appended to a spool file; every
+        ``checkpoint_every`` conversations the spool is synced and the number
+        of completed conversations recorded. With ``resume=True`` a matching
+        checkpoint is picked up, along with its compression settings, and
+        finished conversations are skipped. The aggregate JSON, CSV and HTML
+        files are built from the spool and replaced atomically at the end.
+        """
+        if checkpoint_every < 1:
+            raise ValueError(f"checkpoint_every must be at least 1, got {checkpoint_every}")
         
-        function setupSearch() {{
-            const searchInput = document.getElementById('searchInput');
-            searchInput.addEventListener('input', (e) => {{
-                const query = e.target.value.toLowerCase();
-                
-                if (!query) {{
-                    filteredConversations = conversations;
-                }} else {{
-                    filteredConversations = conversations.filter(conv => 
-                        conv.title.toLowerCase().includes(query) ||
-                        conv.messages.some(msg => msg.content.toLowerCase().includes(query))
-                    );
-                }}
-                
-                renderConversationList();
-            }});
-        }}
-        
-        function escapeHtml(text) {{
-            const div = document.createElement('div');
-            div.textContent = text;
-            return div.innerHTML;
-        }}
-        
-        init();
-    </script>
-</body>
-</html>"""
-    
-    def run_migration(self):
-        """Run the complete migration process."""
         print("🚀 Starting ChatGPT to Gemini Migration\n")
         print("=" * 60)
         
@@ -589,12 +448,52 @@ class ChatGPTMigrator:
         
         # Create output directory
         self.output_dir.mkdir(exist_ok=True)
+        md_dir = self.output_dir / 'markdown'
+        md_dir.mkdir(parents=True, exist_ok=True)
+        
+        checkpoint = self._load_checkpoint() if resume else None
+        completed = checkpoint['completed'] if checkpoint else 0
+        spool_offset = checkpoint['spool_offset'] if checkpoint else 0
+        total = len(self.conversations)
+        
+        if checkpoint:
+            print(f"\n⏩ Resuming after conversation {completed}/{total}")
+            self._restore_compression(checkpoint)
+        elif resume:
+            print(f"\n💡 No checkpoint found, starting from the beginning")
+        
+        spool_file = self.output_dir / CHECKPOINT_SPOOL_FILE
+        with open(spool_file, 'ab') as spool:
+            # Drop anything written after the last checkpoint
+            spool.truncate(spool_offset)
+            spool.seek(spool_offset)
+            
+            print(f"\n📝 Exporting to Markdown...")
+            
+            for idx in range(completed + 1, total + 1):
+                data = self.extract_conversation_data(self.conversations[idx - 1])
+                self._write_markdown_file(md_dir, idx, data)
+                spool.write(json.dumps(data, ensure_ascii=False).encode('utf-8') + b'\n')
+                
+                if idx % checkpoint_every == 0:
+                    self._save_checkpoint(idx, spool)
+                
+                if idx % 50 == 0:
+                    print(f"  Processed {idx}/{total} conversations...")
+            
+            self._save_checkpoint(total, spool)
         
-        # Run all exports
-        self.export_to_markdown()
-        self.export_to_json()
-        self.export_to_csv()
-        self.generate_html_viewer()
+        print(f"✅ Exported {total} markdown files to {md_dir}")
+        
+        # Build the aggregate outputs from the spooled data
+        with open(spool_file, 'r', encoding='utf-8') as f:
+            all_data = [json.loads(line) for line in f]
+        
+        self.export_to_json(all_data)
+        self.export_to_csv(all_data)
+        self.generate_html_viewer(all_data)
+        
+        self._clear_checkpoint()
         
         print("\n" + "=" * 60)
         print("✨ Migration Complete!")
@@ -610,9 +509,123 @@ class ChatGPTMigrator:
         print("  3. Paste into new Gemini conversations as needed")
         print("  4. Use markdown files for easy reference")
 
-def main():
-    migrator = ChatGPTMigrator()
-    migrator.run_migration()
+def run_export(formats, conversations_file=None, compress=(), compression_level=None,
+               timestamp_formatter=None):
+    """Run only the selected exports."""
+    migrator = ChatGPTMigrator(conversations_file, compress, compression_level, timestamp_formatter)
+    migrator.load_conversations()
+    migrator.output_dir.mkdir(exist_ok=True)
+    
+    exporters = {
+        'markdown': migrator.export_to_markdown,
+        'json': migrator.export_to_json,
+        'csv': migrator.export_to_csv,
+        'html': migrator.generate_html_viewer,
+    }
+    for fmt in dict.fromkeys(formats):
+        exporters[fmt]()
+
+
+def _positive_int(value):
+    """argparse type for options that need a whole number of at least 1."""
+    import argparse
+    
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
+
+
+def _add_compression_arguments(parser):
+    """Add the options for precompressed viewer and JSON output."""
+    parser.add_argument('--compress', action='append', choices=tuple(COMPRESSED_SUFFIXES),
+                        default=[], help='Also write compressed copies of the HTML viewer and '
+                                         'JSON export (repeat for several encodings)')
+    parser.add_argument('--compression-level', type=int, choices=range(0, 12), metavar='0-11',
+                        help=f'Compression level (default: {GZIP_DEFAULT_LEVEL} for gzip, '
+                             f'{BROTLI_DEFAULT_LEVEL} for brotli; gzip caps at 9)')
+
+
+def _add_date_arguments(parser):
+    """Add the options controlling how dates are written."""
+    parser.add_argument('--timezone', metavar='TZ',
+                        help="Time zone for dates: 'local' (default), 'UTC', an offset like "
+                             "+05:30, or a name like Europe/Berlin")
+    parser.add_argument('--iso-dates', action='store_true',
+                        help='Write dates as ISO-8601 with UTC offset')
+
+
+def build_parser():
+    """Build the command line parser."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Migrate ChatGPT conversations to formats usable with Gemini.')
+    subparsers = parser.add_subparsers(dest='command')
+    
+    migrate_parser = subparsers.add_parser('migrate', help='Run the full migration (default)')
+    migrate_parser.add_argument('-i', '--input', help='Path to conversations.json')
+    migrate_parser.add_argument('--resume', action='store_true',
+                                help='Continue an interrupted migration from its checkpoint, '
+                                     'keeping its compression settings')
+    migrate_parser.add_argument('--checkpoint-every', type=_positive_int, default=CHECKPOINT_INTERVAL,
+                                metavar='N', help='Save progress every N conversations')
+    _add_compression_arguments(migrate_parser)
+    _add_date_arguments(migrate_parser)
+    
+    export_parser = subparsers.add_parser('export', help='Export to selected formats only')
+    export_parser.add_argument('-i', '--input', help='Path to conversations.json')
+    export_parser.add_argument('-f', '--format', action='append', choices=EXPORT_FORMATS,
+                               required=True, dest='formats',
+                               help='Output format (repeat for several formats)')
+    _add_compression_arguments(export_parser)
+    _add_date_arguments(export_parser)
+    
+    analyze_parser = subparsers.add_parser('analyze', help='Analyze the structure of conversations.json')
+    analyze_parser.add_argument('-i', '--input', default='conversations.json',
+                                help='Path to conversations.json')
+    
+    serve_parser = subparsers.add_parser('serve', help='Start the local conversation viewer')
+    serve_parser.add_argument('-p', '--port', type=int, default=8000, help='Port to listen on')
+    serve_parser.add_argument('--no-browser', action='store_true',
+                              help="Don't open the viewer in a browser")
+    
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    compress = tuple(dict.fromkeys(getattr(args, 'compress', ())))
+    try:
+        _check_compression_support(compress)
+    except ImportError as e:
+        parser.error(str(e))
+    
+    try:
+        timestamp_formatter = TimestampFormatter(getattr(args, 'timezone', None),
+                                                 getattr(args, 'iso_dates', False))
+    except ValueError as e:
+        parser.error(str(e))
+    
+    # Each subcommand imports only the modules it needs
+    if args.command == 'analyze':
+        from analyze_structure import main as analyze_main
+        analyze_main(args.input)
+    elif args.command == 'serve':
+        from view_conversations import serve
+        serve(port=args.port, open_browser=not args.no_browser)
+    elif args.command == 'export':
+        run_export(args.formats, args.input, compress, args.compression_level, timestamp_formatter)
+    else:
+        migrator = ChatGPTMigrator(getattr(args, 'input', None), compress,
+                                   getattr(args, 'compression_level', None), timestamp_formatter)
+        migrator.run_migration(resume=getattr(args, 'resume', False),
+                               checkpoint_every=getattr(args, 'checkpoint_every', CHECKPOINT_INTERVAL))
 
 if __name__ == "__main__":
     main()
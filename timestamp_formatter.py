@@ -0,0 +1,167 @@
+"""
+Shared timestamp formatting for the exporters.
+
+ChatGPT exports store times as Unix timestamps with fractional seconds, while
+every output format only shows whole seconds. Messages are rarely in the same
+second, so instead of caching formatted seconds the formatter caches the UTC
+offset per hour and the date string per day, and works out the time of day
+with integer arithmetic. Hours that contain an offset change (DST switches)
+fall back to exact formatting.
+"""
+
+import math
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+DEFAULT_FORMAT = '%Y-%m-%d %H:%M:%S'
+DEFAULT_CACHE_SIZE = 4096
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_DATE = date(1970, 1, 1)
+_SECONDS = [f"{second:02d}" for second in range(60)]
+
+
+def resolve_timezone(name):
+    """Turn a time zone setting into a tzinfo.
+
+    ``None`` or ``'local'`` means the system time zone (returned as None),
+    ``'UTC'`` and offsets like ``'+05:30'`` are fixed zones, and anything
+    else is looked up as an IANA name such as ``'Europe/Berlin'``.
+    """
+    if not name or name == 'local':
+        return None
+    if name.upper() in ('UTC', 'Z'):
+        return timezone.utc
+    if name[:1] in '+-' and ':' in name:
+        hours, _, minutes = name[1:].partition(':')
+        try:
+            offset = timedelta(hours=int(hours), minutes=int(minutes))
+        except ValueError:
+            raise ValueError(f"Invalid UTC offset: {name}")
+        return timezone(-offset if name[0] == '-' else offset)
+
+    try:
+        from zoneinfo import ZoneInfo
+    except ImportError:
+        raise ValueError(f"Named time zones need Python 3.9+, use an offset like +05:30 instead of {name}")
+    try:
+        return ZoneInfo(name)
+    except (KeyError, ValueError):
+        raise ValueError(f"Unknown time zone: {name}")
+
+
+def _to_second(ts):
+    """Return the whole second ``datetime.fromtimestamp`` would show for ts."""
+    second = math.floor(ts)
+    # fromtimestamp rounds to microseconds, which can carry into the next second
+    if ts - second >= 0.9999995:
+        second += 1
+    return second
+
+
+def _offset_suffix(offset):
+    """Format an offset in seconds as an ISO-8601 suffix like +05:30."""
+    sign = '-' if offset < 0 else '+'
+    hours, minutes = divmod(abs(offset) // 60, 60)
+    return f"{sign}{hours:02d}:{minutes:02d}"
+
+
+class TimestampFormatter:
+    """Formats Unix timestamps as dates, in the local or a given time zone."""
+
+    def __init__(self, tz=None, iso=False, cache_size=DEFAULT_CACHE_SIZE):
+        self.tz_name = tz or 'local'
+        self.tz = resolve_timezone(tz)
+        self.iso = iso
+        self._separator = 'T' if iso else ' '
+        self._hour_info = lru_cache(maxsize=cache_size)(self._hour_info_uncached)
+        self._day_string = lru_cache(maxsize=cache_size)(self._day_string_uncached)
+        self._format_exact = lru_cache(maxsize=cache_size)(self._format_exact_uncached)
+
+    def _utc_offset(self, second):
+        if self.tz is None:
+            return int((datetime.fromtimestamp(second) - _EPOCH).total_seconds()) - second
+        return int(datetime.fromtimestamp(second, self.tz).utcoffset().total_seconds())
+
+    def _hour_info_uncached(self, hour):
+        """Return (offset, ISO suffix) for a UTC hour, or None if it changes within it."""
+        start = hour * 3600
+        offset = self._utc_offset(start)
+        if offset != self._utc_offset(start + 3599) or offset % 60:
+            return None
+        return offset, _offset_suffix(offset) if self.iso else ''
+
+    def _day_string_uncached(self, day):
+        return (_EPOCH_DATE + timedelta(days=day)).isoformat()
+
+    def _format_exact_uncached(self, second):
+        if self.tz is None:
+            dt = datetime.fromtimestamp(second)
+            if not self.iso:
+                return dt.strftime(DEFAULT_FORMAT)
+            # ISO output always carries the UTC offset, even for local time
+            dt = dt.astimezone()
+        else:
+            dt = datetime.fromtimestamp(second, self.tz)
+        return dt.isoformat(timespec='seconds') if self.iso else dt.strftime(DEFAULT_FORMAT)
+
+    def _format_second(self, second, hour_info, day_string):
+        """Format a whole second using the given per-hour and per-day lookups."""
+        info = hour_info(second // 3600)
+        if info is None:
+            return self._format_exact(second)
+        offset, suffix = info
+        day, rem = divmod(second + offset, 86400)
+        hours, rem = divmod(rem, 3600)
+        minutes, seconds = divmod(rem, 60)
+        return f"{day_string(day)}{self._separator}{hours:02d}:{minutes:02d}:{seconds:02d}{suffix}"
+
+    def settings(self):
+        """Return the settings that affect the formatted output."""
+        return {'timezone': self.tz_name, 'iso': self.iso}
+
+    def format(self, ts, default=''):
+        """Format a single timestamp, returning ``default`` if it is missing."""
+        if not ts:
+            return default
+        return self._format_second(_to_second(ts), self._hour_info, self._day_string)
+
+    def format_many(self, timestamps, default=''):
+        """Format a batch of timestamps, such as all messages in a conversation.
+
+        Offsets, days and minutes are looked up once per batch, so messages
+        that are close together only pay for picking the seconds.
+        """
+        hours = {}
+        minutes = {}
+        result = []
+        append = result.append
+        for ts in timestamps:
+            if not ts:
+                append(default)
+                continue
+            second = math.floor(ts)
+            if ts - second >= 0.9999995:
+                second += 1
+
+            hour = second // 3600
+            info = hours.get(hour)
+            if info is None:
+                info = hours[hour] = self._hour_info(hour) or False
+            if info is False:
+                append(self._format_exact(second))
+                continue
+
+            offset, suffix = info
+            minute, sec = divmod(second + offset, 60)
+            prefix = minutes.get(minute)
+            if prefix is None:
+                day, rem = divmod(minute, 1440)
+                prefix = minutes[minute] = (f"{self._day_string(day)}{self._separator}"
+                                            f"{rem // 60:02d}:{rem % 60:02d}:")
+            append(prefix + _SECONDS[sec] + suffix)
+        return result
+
+    def cache_info(self):
+        """Return hit/miss statistics of the per-hour offset cache."""
+        return self._hour_info.cache_info()
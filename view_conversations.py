@@ -3,39 +3,150 @@ Simple HTTP server to view ChatGPT conversations.
 Run this script and open http://localhost:8000 in your browser.
 """
 
+import email.utils
 import http.server
 import socketserver
 import os
 import sys
 import webbrowser
+from datetime import datetime, timezone
+from http import HTTPStatus
 from pathlib import Path
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
-# Change to the migrated_conversations directory
-os.chdir(Path(__file__).parent / 'migrated_conversations')
-
 PORT = 8000
+SERVE_DIR = Path(__file__).parent / 'migrated_conversations'
+
+# Precompressed siblings written by the migration, preferred in this order on equal q-values
+PRECOMPRESSED = [('br', '.br'), ('gzip', '.gz')]
+
+def accepted_encodings(header):
+    """Return a dict of content coding to q-value from an Accept-Encoding header.
+
+    Codings listed with q=0 are kept so they can override a ``*`` entry.
+    """
+    accepted = {}
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        name = name.strip().lower()
+        if name:
+            accepted[name] = q
+    return accepted
+
+def choose_encoding(accepted, available):
+    """Pick the available coding with the highest q-value, or None for the plain file.
+
+    ``available`` is in order of preference, which only breaks ties. A
+    compressed coding must also beat an explicit q-value for ``identity``.
+    """
+    best, best_q = None, accepted.get('identity', 0.0)
+    for encoding in available:
+        q = accepted.get(encoding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
 
 class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    vary_encoding = False
+
     def end_headers(self):
         # Add CORS headers
         self.send_header('Access-Control-Allow-Origin', '*')
+        if self.vary_encoding:
+            self.send_header('Vary', 'Accept-Encoding')
         super().end_headers()
 
-print(f">> Starting server at http://localhost:{PORT}")
-print(f">> Serving files from: {os.getcwd()}")
-print(f"\n>> Opening conversation viewer in your browser...")
-print(f"\nPress Ctrl+C to stop the server\n")
+    def send_head(self):
+        """Serve a precompressed sibling when the client accepts its encoding."""
+        path = self.translate_path(self.path)
+        self.vary_encoding = False
+        if not os.path.isfile(path):
+            return super().send_head()
+
+        siblings = {encoding: path + suffix for encoding, suffix in PRECOMPRESSED
+                    if os.path.isfile(path + suffix)}
+        if siblings:
+            self.vary_encoding = True
+            accepted = accepted_encodings(self.headers.get('Accept-Encoding'))
+            encoding = choose_encoding(accepted, list(siblings))
+            if encoding:
+                return self.send_precompressed(path, siblings[encoding], encoding)
+
+        return super().send_head()
+
+    def not_modified_since(self, mtime):
+        """Check If-Modified-Since the same way SimpleHTTPRequestHandler does."""
+        if 'If-Modified-Since' not in self.headers or 'If-None-Match' in self.headers:
+            return False
+        try:
+            ims = email.utils.parsedate_to_datetime(self.headers['If-Modified-Since'])
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if ims.tzinfo is None:
+            ims = ims.replace(tzinfo=timezone.utc)
+        if ims.tzinfo is not timezone.utc:
+            return False
+        last_modified = datetime.fromtimestamp(mtime, timezone.utc).replace(microsecond=0)
+        return last_modified <= ims
+
+    def send_precompressed(self, path, compressed_path, encoding):
+        """Send headers for a compressed file and return it for copying."""
+        try:
+            f = open(compressed_path, 'rb')
+        except OSError:
+            return super().send_head()
+
+        try:
+            fs = os.fstat(f.fileno())
+            if self.not_modified_since(fs.st_mtime):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.end_headers()
+                f.close()
+                return None
+
+            self.send_response(200)
+            self.send_header('Content-type', self.guess_type(path))
+            self.send_header('Content-Encoding', encoding)
+            self.send_header('Content-Length', str(fs.st_size))
+            self.send_header('Last-Modified', self.date_time_string(fs.st_mtime))
+            self.end_headers()
+            return f
+        except:
+            f.close()
+            raise
+
+def serve(port=PORT, open_browser=True):
+    """Serve the migrated conversations folder until interrupted."""
+    # Change to the migrated_conversations directory
+    os.chdir(SERVE_DIR)
+
+    print(f">> Starting server at http://localhost:{port}")
+    print(f">> Serving files from: {os.getcwd()}")
+    if open_browser:
+        print(f"\n>> Opening conversation viewer in your browser...")
+    print(f"\nPress Ctrl+C to stop the server\n")
+
+    # Open browser automatically
+    if open_browser:
+        webbrowser.open(f'http://localhost:{port}/html/conversation_viewer.html')
 
-# Open browser automatically
-webbrowser.open(f'http://localhost:{PORT}/html/conversation_viewer_v2.html')
+    # Start server
+    with socketserver.TCPServer(("", port), MyHTTPRequestHandler) as httpd:
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n\n>> Server stopped")
 
-# Start server
-with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
-    try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        print("\n\n>> Server stopped")
+if __name__ == "__main__":
+    serve()